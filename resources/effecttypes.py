@@ -1,24 +1,54 @@
 
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from datetime import timedelta
 from typing import Dict
 
-def fetch_type_data() -> Dict[str, Dict[str, float]]:
-    """Fetch type effectiveness data from PokeAPI and format it into a type chart."""
+TYPE_NAMES = [
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", 
+    "poison", "ground", "flying", "psychic", "bug", "rock", "ghost",
+    "dragon", "steel", "dark", "fairy"
+]
+
+async def fetch_type(session: aiohttp.ClientSession, type_name: str):
+    """Fetch a single type from PokeAPI, returning None if the request failed."""
+    try:
+        async with session.get(f"https://pokeapi.co/api/v2/type/{type_name}") as response:
+            if response.status != 200:
+                print(f"Failed to fetch data for {type_name}")
+                return None
+            return orjson.loads(await response.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        print(f"Failed to fetch data for {type_name}")
+        return None
+
+async def fetch_type_data() -> Dict[str, Dict[str, float]]:
+    """Fetch type effectiveness data from PokeAPI and format it into a type chart.
+
+    Raises RuntimeError if any type could not be fetched.
+    """
     type_chart = {}
-    type_names = [
-        "normal", "fire", "water", "grass", "electric", "ice", "fighting", 
-        "poison", "ground", "flying", "psychic", "bug", "rock", "ghost",
-        "dragon", "steel", "dark", "fairy"
-    ]
-    
-    for type_name in type_names:
-        response = requests.get(f"https://pokeapi.co/api/v2/type/{type_name}")
-        if response.status_code != 200:
-            print(f"Failed to fetch data for {type_name}")
-            continue
-            
-        data = response.json()
+
+    # All type lookups are independent, so fire them concurrently over one
+    # session, with responses cached on disk so re-runs skip the network entirely
+    cache = SQLiteBackend('pokeapi_cache_async', expire_after=timedelta(days=30), allowed_codes=(200,))
+    async with CachedSession(
+        cache=cache,
+        connector=aiohttp.TCPConnector(limit=len(TYPE_NAMES)),
+        headers={"Accept-Encoding": "gzip", "User-Agent": "pokemonlegends/1.0"},
+        timeout=aiohttp.ClientTimeout(total=10),
+    ) as session:
+        results = await asyncio.gather(*(fetch_type(session, type_name) for type_name in TYPE_NAMES))
+
+    # A partial chart would silently break damage calculations, so fail instead of
+    # letting main() overwrite types.json with it
+    missing = [type_name for type_name, data in zip(TYPE_NAMES, results) if data is None]
+    if missing:
+        raise RuntimeError(f"Failed to fetch type data for: {', '.join(missing)}")
+
+    for type_name, data in zip(TYPE_NAMES, results):
         damage_relations = data["damage_relations"]
         
         # Initialize empty dict for this type's effectiveness
@@ -39,12 +69,12 @@ def fetch_type_data() -> Dict[str, Dict[str, float]]:
     return type_chart
 
 def main():
-    type_chart = fetch_type_data()
+    type_chart = asyncio.run(fetch_type_data())
     
     # Write to types.json
     print(type_chart)
-    with open("types.json", "w") as f:
-        json.dump(type_chart, f, indent=2)
+    with open("types.json", "wb") as f:
+        f.write(orjson.dumps(type_chart, option=orjson.OPT_INDENT_2))
         
 if __name__ == "__main__":
     main()
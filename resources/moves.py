@@ -1,13 +1,57 @@
-import json
-import requests
-import time
-import re # For parsing multi-hit ranges
-
-POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
+import asyncio
+import hishel
+import httpx
+import orjson
+import os
+from aiolimiter import AsyncLimiter
+from datetime import timedelta
+from pathlib import Path
+import re # For inferring effects from descriptions
+
+POKEAPI_GRAPHQL_URL = "https://beta.pokeapi.co/graphql/v1beta"
 OUTPUT_FILENAME = "moves.json"
 MOVE_RANGE_START = 1
 MOVE_RANGE_END = 300 # Adjust as needed (max ~900+, but ~300 covers many common moves)
-REQUEST_DELAY = 0.1 # Seconds between requests
+GRAPHQL_BATCH_SIZE = 50 # Moves fetched per GraphQL query
+REQUESTS_PER_SECOND = 10 # Aggregate rate limit towards PokeAPI
+MAX_CONCURRENT_REQUESTS = 10 # Requests in flight at once
+
+# Only the fields parse_effect_data and the move output read, for a whole batch of moves at
+# once; effect texts are filtered to English server-side
+MOVES_QUERY = """
+query moves($ids: [Int!]) {
+  pokemon_v2_move(where: {id: {_in: $ids}}) {
+    id
+    name
+    accuracy
+    power
+    pp
+    priority
+    move_effect_chance
+    pokemon_v2_type { name }
+    pokemon_v2_movedamageclass { name }
+    pokemon_v2_movetarget { name }
+    pokemon_v2_movemeta {
+      pokemon_v2_movemetaailment { name }
+      ailment_chance
+      healing
+      stat_chance
+      flinch_chance
+      min_hits
+      max_hits
+    }
+    pokemon_v2_movemetastatchanges {
+      change
+      pokemon_v2_stat { name }
+    }
+    pokemon_v2_moveeffect {
+      pokemon_v2_moveeffecteffecttexts(where: {pokemon_v2_language: {name: {_eq: "en"}}}, limit: 1) {
+        effect
+      }
+    }
+  }
+}
+"""
 
 # --- Mappings from PokeAPI to Your Structure ---
 
@@ -80,187 +124,194 @@ def map_status_name(pokeapi_ailment_name):
 
 def get_english_effect(effect_entries):
     """Extracts the English effect description."""
-    for entry in effect_entries:
-        if entry['language']['name'] == 'en':
-            # Replace PokeAPI's $effect_chance with the actual chance if present
-            # Might need refinement based on how effect_chance is used in the text
-             return entry['effect'].replace('$effect_chance', '{effect_chance}') # Placeholder
-             # return entry['short_effect'].replace('$effect_chance', '{effect_chance}') # short_effect is often better
-
-    return "No English description found."
+    effect = next((entry['effect'] for entry in effect_entries if entry['language']['name'] == 'en'), None)
+    # effect = next((entry['short_effect'] for entry in ...), None) # short_effect is often better
+    if effect is None:
+        return "No English description found."
+
+    # Replace PokeAPI's $effect_chance with the actual chance if present
+    # Might need refinement based on how effect_chance is used in the text
+    return effect.replace('$effect_chance', '{effect_chance}') # Placeholder
+
+def from_graphql_move(move):
+    """Reshapes a GraphQL move record into the REST /move/{id} layout the parser expects."""
+    meta = move['pokemon_v2_movemeta'][0] if move['pokemon_v2_movemeta'] else {}
+    effect = move['pokemon_v2_moveeffect'] or {}
+    return {
+        "id": move['id'],
+        "name": move['name'],
+        "accuracy": move['accuracy'],
+        "power": move['power'],
+        "pp": move['pp'],
+        "priority": move['priority'],
+        "effect_chance": move['move_effect_chance'],
+        "type": move['pokemon_v2_type'],
+        "damage_class": move['pokemon_v2_movedamageclass'],
+        "target": move['pokemon_v2_movetarget'],
+        "meta": {
+            "ailment": meta.get('pokemon_v2_movemetaailment') or {"name": "none"},
+            "ailment_chance": meta.get('ailment_chance', 0),
+            "healing": meta.get('healing', 0),
+            "stat_chance": meta.get('stat_chance', 0),
+            "flinch_chance": meta.get('flinch_chance', 0),
+            "min_hits": meta.get('min_hits'),
+            "max_hits": meta.get('max_hits'),
+        },
+        "stat_changes": [
+            {"change": change['change'], "stat": change['pokemon_v2_stat']}
+            for change in move['pokemon_v2_movemetastatchanges']
+        ],
+        "effect_entries": [
+            {"effect": text['effect'], "language": {"name": "en"}} # The query only asks for English
+            for text in effect.get('pokemon_v2_moveeffecteffecttexts', [])
+        ],
+    }
 
 # --- Effect Parsing Logic (Heuristic) ---
 
-def parse_effect_data(move_data):
+DAMAGING_CLASSES = frozenset({"physical", "special"})
+
+def _damage_primary_effect(min_hits, max_hits, move_name):
+    """Builds the damage primary effect, including the multi-hit range if the move has one."""
+    primary_effect = {"type": "damage", "parameters": {}}
+    if min_hits is not None and max_hits is not None:
+        if move_name == "triple-kick":
+            primary_effect["parameters"]["multi_hit"] = {"min": 3, "max": 3}
+        else:
+            primary_effect["parameters"]["multi_hit"] = {"min": min_hits, "max": max_hits}
+    return primary_effect
+
+# Which effect type applies each (mapped) ailment; anything else is not applied
+VOLATILE_AILMENTS = frozenset({
+    "confusion", "leech_seed", "bound", "infatuation", "torment", "disable",
+    "yawn", "heal_block", "embargo", "perish_song", "ingrain",
+})
+NONVOLATILE_AILMENTS = frozenset({"toxic", "paralysis", "sleep", "freeze", "burn", "poison"})
+AILMENT_KIND = (
+    {ailment: "apply_status" for ailment in NONVOLATILE_AILMENTS}
+    | {ailment: "apply_volatile_status" for ailment in VOLATILE_AILMENTS}
+)
+
+# Secondary effects inferred from the description when only effect_chance is known.
+# Checked in order, keywords first, and the first match wins.
+INFERRED_KEYWORD_EFFECTS = (
+    (("paralyze",), {"type": "apply_status", "parameters": {"status": "paralysis", "target": "target"}}),
+    (("burn",), {"type": "apply_status", "parameters": {"status": "burn", "target": "target"}}),
+    (("freeze",), {"type": "apply_status", "parameters": {"status": "freeze", "target": "target"}}),
+    (("poison",), {"type": "apply_status", "parameters": {"status": "poison", "target": "target"}}),
+    (("flinch",), {"type": "apply_volatile_status", "parameters": {"status": "flinch", "target": "target"}}),
+    (("confuse", "confusion"), {"type": "apply_volatile_status", "parameters": {"status": "confusion", "target": "target"}}),
+)
+INFERRED_PATTERN_EFFECTS = tuple(
+    (re.compile(pattern), {"type": "stat_change", "parameters": {"changes": [{"stat": stat, "stages": -1}], "target": "target"}})
+    for pattern, stat in (
+        (r"lower.*attack", "attack"),
+        (r"lower.*defense", "defense"),
+        (r"lower.*special attack", "special_attack"),
+        (r"lower.*special defense", "special_defense"),
+        (r"lower.*speed", "speed"),
+        (r"lower.*accuracy", "accuracy"),
+    )
+)
+
+# --- Hardcoded Overrides for Specific Moves (Essential) ---
+
+def _field_effect(effect_type, duration, target_side):
+    """Builds an apply_field_effect primary effect."""
+    return {
+        "type": "apply_field_effect",
+        "parameters": {
+            "effect_type": effect_type,
+            "duration": duration,
+            "target_side": target_side
+        }
+    }
+
+# Primary effect for moves whose PokeAPI data can't be parsed reliably
+OVERRIDES = {
+    # Screens and other side conditions
+    "light-screen": _field_effect("light_screen", 5, "user"),
+    "reflect": _field_effect("reflect", 5, "user"),
+    "mist": _field_effect("mist", 5, "user"), # Add Mist if needed
+    "safeguard": _field_effect("safeguard", 5, "user"), # Add Safeguard if needed
+    "tailwind": _field_effect("tailwind", 4, "user"),
+    # Entry hazards (persistent, so no duration)
+    "spikes": _field_effect("spikes", None, "opponent"), # Needs layer tracking logic
+    "toxic-spikes": _field_effect("toxic_spikes", None, "opponent"), # Needs layer tracking
+    "stealth-rock": _field_effect("stealth_rock", None, "opponent"),
+    "sticky-web": _field_effect("sticky_web", None, "opponent"),
+    # Weather (maybe a dedicated "set_weather" type later)
+    "rain-dance": _field_effect("rain", 5, "whole_field"),
+    "sunny-day": _field_effect("harsh_sunlight", 5, "whole_field"),
+    "sandstorm": _field_effect("sandstorm", 5, "whole_field"),
+    "hail": _field_effect("hail", 5, "whole_field"),
+    "trick-room": _field_effect("trick_room", 5, "whole_field"),
+    "toxic": {
+        "type": "apply_status",
+        "parameters": {"status": "toxic", "target": "target"}
+    },
+    "swords-dance": { # Move 14 - this was the cause!
+        "type": "stat_change",
+        "parameters": {
+            "changes": [{"stat": "attack", "stages": 2}],
+            "target": "user"
+        }
+    },
+    # Simple heal moves (add others here)
+    "recover": {"type": "heal", "parameters": {"percent": 50, "target": "user"}},
+    "roost": {"type": "heal", "parameters": {"percent": 50, "target": "user"}},
+    "soft-boiled": {"type": "heal", "parameters": {"percent": 50, "target": "user"}},
+    "seismic-toss": {"type": "fixed_damage", "parameters": {"damage_source": "user_level"}},
+    "night-shade": {"type": "fixed_damage", "parameters": {"damage_source": "user_level"}},
+    "roar": {"type": "switch_target", "parameters": {}}, # No specific params needed here
+    "whirlwind": {"type": "switch_target", "parameters": {}},
+}
+
+def parse_general_effects(move_data, description):
     """
-    Attempts to parse PokeAPI move data into primary and secondary effects.
-    This is heuristic and will need manual refinement for many moves.
-    Returns a tuple: (primary_effect, secondary_effect, description)
+    Heuristically derives (primary_effect, secondary_effect) from a move's meta data,
+    falling back to the description text for the secondary effect.
     """
     primary_effect = None
     secondary_effect = None
 
-    meta = move_data.get('meta', {})
+    # --- General Parsing Logic (continues as before) ---
+    # Every field the heuristics read, looked up once
     damage_class = move_data['damage_class']['name']
     power = move_data['power']
     effect_chance = move_data.get('effect_chance') # Can be None
     move_name = move_data['name']
+    stat_changes = move_data.get('stat_changes') or []
 
-    # --- Calculate description early ---
-    description = get_english_effect(move_data.get('effect_entries', []))
-    # Placeholder replacement will happen later after potential secondary effect calculation
-
-
-    # --- Hardcoded Overrides for Specific Moves (Essential) ---
-    if move_name in ["light-screen", "reflect", "mist", "safeguard", "tailwind"]:
-        field_map = {
-            "light-screen": {"type": "light_screen", "duration": 5, "side": "user"},
-            "reflect": {"type": "reflect", "duration": 5, "side": "user"},
-            "mist": {"type": "mist", "duration": 5, "side": "user"}, # Add Mist if needed
-            "safeguard": {"type": "safeguard", "duration": 5, "side": "user"}, # Add Safeguard if needed
-            "tailwind": {"type": "tailwind", "duration": 4, "side": "user"},
-        }
-        fm = field_map[move_name]
-        primary_effect = {
-            "type": "apply_field_effect",
-            "parameters": {
-                "effect_type": fm["type"],
-                "duration": fm["duration"],
-                "target_side": fm["side"]
-            }
-        }
-        # Return all three values now
-        return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name in ["spikes", "toxic-spikes", "stealth-rock", "sticky-web"]:
-         hazard_map = {
-             "spikes": {"type": "spikes", "side": "opponent"}, # Needs layer tracking logic
-             "toxic-spikes": {"type": "toxic_spikes", "side": "opponent"}, # Needs layer tracking
-             "stealth-rock": {"type": "stealth_rock", "side": "opponent"},
-             "sticky-web": {"type": "sticky_web", "side": "opponent"},
-         }
-         hm = hazard_map[move_name]
-         primary_effect = {
-             "type": "apply_field_effect",
-             "parameters": {
-                "effect_type": hm["type"],
-                "duration": None, # Hazards are persistent
-                "target_side": hm["side"]
-             }
-         }
-         # Return all three values now
-         return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name in ["rain-dance", "sunny-day", "sandstorm", "hail"]:
-         weather_map = {
-             "rain-dance": "rain",
-             "sunny-day": "harsh_sunlight",
-             "sandstorm": "sandstorm",
-             "hail": "hail",
-         }
-         primary_effect = {
-             "type": "apply_field_effect", # Or maybe a dedicated "set_weather" type
-             "parameters": {
-                 "effect_type": weather_map[move_name],
-                 "duration": 5,
-                 "target_side": "whole_field"
-             }
-         }
-         # Return all three values now
-         return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name == "trick-room":
-         primary_effect = {
-             "type": "apply_field_effect",
-             "parameters": {
-                 "effect_type": "trick_room",
-                 "duration": 5,
-                 "target_side": "whole_field"
-             }
-         }
-         # Return all three values now
-         return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name == "toxic":
-        primary_effect = {
-            "type": "apply_status",
-            "parameters": {"status": "toxic", "target": "target"}
-        }
-         # Return all three values now
-        return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name == "swords-dance": # Move 14 - this was the cause!
-         primary_effect = {
-             "type": "stat_change",
-             "parameters": {
-                 "changes": [{"stat": "attack", "stages": 2}],
-                 "target": "user"
-             }
-         }
-         # Return all three values now
-         return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name == "recover" or move_name == "roost" or move_name == "soft-boiled": # Add other simple heal moves
-         primary_effect = {
-             "type": "heal",
-             "parameters": {"percent": 50, "target": "user"}
-         }
-         # Return all three values now
-         return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name in ["seismic-toss", "night-shade"]:
-        primary_effect = {
-             "type": "fixed_damage",
-             "parameters": {"damage_source": "user_level"}
-        }
-         # Return all three values now
-        return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-    if move_name in ["roar", "whirlwind"]:
-        primary_effect = {
-             "type": "switch_target",
-             "parameters": {} # No specific params needed here
-        }
-         # Return all three values now
-        return primary_effect, None, description.replace('{effect_chance}', '0') # No chance here
-
-
-    # --- General Parsing Logic (continues as before) ---
-    ailment = map_status_name(meta.get('ailment', {}).get('name', 'none'))
+    meta = move_data.get('meta') or {} # PokeAPI sends null meta for some moves
+    ailment = map_status_name((meta.get('ailment') or {}).get('name', 'none'))
     ailment_chance = meta.get('ailment_chance', 0)
     healing = meta.get('healing', 0)
-    stat_changes = move_data.get('stat_changes', [])
     stat_chance = meta.get('stat_chance', 0)
     flinch_chance = meta.get('flinch_chance', 0)
     min_hits = meta.get('min_hits')
     max_hits = meta.get('max_hits')
 
     # 1. Determine Primary Effect (continues as before)
-    if damage_class in ["physical", "special"] and power is not None:
-        primary_effect = {"type": "damage", "parameters": {}}
-        if min_hits is not None and max_hits is not None:
-             primary_effect["parameters"]["multi_hit"] = {"min": min_hits, "max": max_hits}
-             if move_name == "triple-kick":
-                 primary_effect["parameters"]["multi_hit"] = {"min": 3, "max": 3}
+    if damage_class in DAMAGING_CLASSES and power is not None:
+        primary_effect = _damage_primary_effect(min_hits, max_hits, move_name)
 
     elif damage_class == "status":
         if ailment and ailment_chance == 0:
-            if ailment in ["confusion", "leech_seed", "bound", "infatuation", "torment", "disable", "yawn", "heal_block", "embargo", "perish_song", "ingrain"]:
-                 primary_effect = {"type": "apply_volatile_status", "parameters": {"status": ailment, "target": "target"}}
-            elif ailment in ["toxic", "paralysis", "sleep", "freeze", "burn", "poison"]:
-                 primary_effect = {"type": "apply_status", "parameters": {"status": ailment, "target": "target"}}
+            kind = AILMENT_KIND.get(ailment)
+            if kind:
+                 primary_effect = {"type": kind, "parameters": {"status": ailment, "target": "target"}}
 
         elif stat_changes and stat_chance == 0:
-            changes = []
-            target = "user"
-            for change in stat_changes:
-                stat = map_stat_name(change['stat']['name'])
-                if stat:
-                    changes.append({"stat": stat, "stages": change['change']})
-                    if change['change'] < 0: target = "target"
-                    else: target = "user"
+            changes = [
+                {"stat": stat, "stages": change['change']}
+                for change in stat_changes
+                if (stat := map_stat_name(change['stat']['name']))
+            ]
 
             if changes:
+                # The last mapped change decides who the effect applies to
+                target = "target" if changes[-1]["stages"] < 0 else "user"
                 primary_effect = {
                     "type": "stat_change",
                     "parameters": {"changes": changes, "target": target}
@@ -271,12 +322,8 @@ def parse_effect_data(move_data):
 
     # If no primary effect determined yet, default based on damage class
     if primary_effect is None:
-        if damage_class in ["physical", "special"]:
-             primary_effect = {"type": "damage", "parameters": {}}
-             if min_hits is not None and max_hits is not None:
-                 primary_effect["parameters"]["multi_hit"] = {"min": min_hits, "max": max_hits}
-                 if move_name == "triple-kick":
-                    primary_effect["parameters"]["multi_hit"] = {"min": 3, "max": 3}
+        if damage_class in DAMAGING_CLASSES:
+             primary_effect = _damage_primary_effect(min_hits, max_hits, move_name)
         else:
              primary_effect = {"type": "unknown_status", "parameters": {}}
 
@@ -285,13 +332,7 @@ def parse_effect_data(move_data):
     secondary_candidates = []
 
     if ailment and ailment_chance > 0:
-        status_type = "apply_status"
-        if ailment in ["toxic", "paralysis", "sleep", "freeze", "burn", "poison"]:
-             status_type = "apply_status"
-        elif ailment in ["confusion", "leech_seed", "bound", "infatuation", "torment", "disable", "yawn", "heal_block", "embargo", "perish_song", "ingrain"]:
-             status_type = "apply_volatile_status"
-        else:
-             status_type = None
+        status_type = AILMENT_KIND.get(ailment)
 
         if status_type:
              secondary_candidates.append({
@@ -300,16 +341,15 @@ def parse_effect_data(move_data):
              })
 
     if stat_changes and stat_chance > 0:
-        changes = []
-        target = "target"
-        for change in stat_changes:
-             stat = map_stat_name(change['stat']['name'])
-             if stat:
-                 changes.append({"stat": stat, "stages": change['change']})
-                 if change['change'] < 0: target = "target"
-                 else: target = "user"
+        changes = [
+            {"stat": stat, "stages": change['change']}
+            for change in stat_changes
+            if (stat := map_stat_name(change['stat']['name']))
+        ]
 
         if changes:
+             # The last mapped change decides who the effect applies to
+             target = "target" if changes[-1]["stages"] < 0 else "user"
              secondary_candidates.append({
                  "chance": stat_chance,
                  "effect": {"type": "stat_change", "parameters": {"changes": changes, "target": target}}
@@ -329,18 +369,15 @@ def parse_effect_data(move_data):
     if secondary_effect is None and effect_chance is not None and effect_chance > 0:
         desc_lower = description.lower() # Use pre-calculated description
         inferred_secondary = None
-        if "paralyze" in desc_lower: inferred_secondary = {"type": "apply_status", "parameters": {"status": "paralysis", "target": "target"}}
-        elif "burn" in desc_lower: inferred_secondary = {"type": "apply_status", "parameters": {"status": "burn", "target": "target"}}
-        elif "freeze" in desc_lower: inferred_secondary = {"type": "apply_status", "parameters": {"status": "freeze", "target": "target"}}
-        elif "poison" in desc_lower: inferred_secondary = {"type": "apply_status", "parameters": {"status": "poison", "target": "target"}}
-        elif "flinch" in desc_lower: inferred_secondary = {"type": "apply_volatile_status", "parameters": {"status": "flinch", "target": "target"}}
-        elif "confuse" in desc_lower or "confusion" in desc_lower: inferred_secondary = {"type": "apply_volatile_status", "parameters": {"status": "confusion", "target": "target"}}
-        elif re.search(r"lower.*attack", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "attack", "stages": -1}], "target": "target"}}
-        elif re.search(r"lower.*defense", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "defense", "stages": -1}], "target": "target"}}
-        elif re.search(r"lower.*special attack", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "special_attack", "stages": -1}], "target": "target"}}
-        elif re.search(r"lower.*special defense", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "special_defense", "stages": -1}], "target": "target"}}
-        elif re.search(r"lower.*speed", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "speed", "stages": -1}], "target": "target"}}
-        elif re.search(r"lower.*accuracy", desc_lower): inferred_secondary = {"type": "stat_change", "parameters": {"changes": [{"stat": "accuracy", "stages": -1}], "target": "target"}}
+        for keywords, effect in INFERRED_KEYWORD_EFFECTS:
+            if any(keyword in desc_lower for keyword in keywords):
+                inferred_secondary = effect
+                break
+        else:
+            for pattern, effect in INFERRED_PATTERN_EFFECTS:
+                if pattern.search(desc_lower):
+                    inferred_secondary = effect
+                    break
 
 
         if inferred_secondary:
@@ -349,42 +386,86 @@ def parse_effect_data(move_data):
                  "effect": inferred_secondary
             }
 
-    # --- Final description formatting ---
-    # Determine the actual chance to display (either from secondary effect or effect_chance field)
-    display_chance = '0'
-    if secondary_effect and 'chance' in secondary_effect:
-        display_chance = str(secondary_effect['chance'])
-    elif effect_chance is not None:
-        display_chance = str(effect_chance)
+    return primary_effect, secondary_effect
+
+
+def parse_effect_data(move_data):
+    """
+    Attempts to parse PokeAPI move data into primary and secondary effects.
+    This is heuristic and will need manual refinement for many moves.
+    Returns a tuple: (primary_effect, secondary_effect, description)
+    """
+    effect_chance = move_data.get('effect_chance') # Can be None
+
+    # --- Calculate description early ---
+    description = get_english_effect(move_data.get('effect_entries', []))
+    # Placeholder replacement happens once at the end, after the effects are known
 
-    # Replace placeholder in the description string
-    description = description.replace('{effect_chance}', display_chance)
 
+    # --- Hardcoded Overrides for Specific Moves (Essential) ---
+    override = OVERRIDES.get(move_data['name'])
+    if override is not None:
+        primary_effect, secondary_effect = override, None
+        display_chance = '0' # No chance here
+    else:
+        primary_effect, secondary_effect = parse_general_effects(move_data, description)
+        # Determine the actual chance to display (either from secondary effect or effect_chance field)
+        display_chance = '0'
+        if secondary_effect and 'chance' in secondary_effect:
+            display_chance = str(secondary_effect['chance'])
+        elif effect_chance is not None:
+            display_chance = str(effect_chance)
 
-    # The final return, always returning three values
-    return primary_effect, secondary_effect, description
+    # --- Final description formatting ---
+    # The single return site, always returning three values
+    return primary_effect, secondary_effect, description.replace('{effect_chance}', display_chance)
 
 
 # --- Main Script ---
-all_moves_data = {}
 
-print(f"Fetching moves {MOVE_RANGE_START} to {MOVE_RANGE_END} from PokeAPI...")
+async def forget_cached_response(storage, response):
+    """Drops a stored response so a bad 200 isn't replayed from the cache on later runs."""
+    cache_key = response.extensions.get("cache_metadata", {}).get("cache_key")
+    if cache_key is not None:
+        await storage.remove(cache_key)
 
-with open('resources/needmoves.json', 'r') as f:
-    move_ids = json.load(f)
 
-for move_id in move_ids:
+async def fetch_move_batch(client, storage, semaphore, limiter, move_ids):
+    """Fetches a batch of moves in one GraphQL query. Returns None if the request failed."""
+    payload = {"query": MOVES_QUERY, "variables": {"ids": move_ids}}
     try:
-        url = f"{POKEAPI_BASE_URL}/move/{move_id}/"
-        response = requests.get(url)
-        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+        async with semaphore, limiter: # Be polite to the API
+            response = await client.post(POKEAPI_GRAPHQL_URL, json=payload)
+            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+    except httpx.HTTPError as e:
+        print(f"Error fetching moves {move_ids[0]}-{move_ids[-1]}: {e}")
+        return None
+
+    # Hasura reports query errors with a 200, which the cache will have stored
+    try:
+        result = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        print(f"Error fetching moves {move_ids[0]}-{move_ids[-1]}: {e}")
+        await forget_cached_response(storage, response)
+        return None
+
+    data = result.get('data') if isinstance(result, dict) else None
+    if not data or result.get('errors') or data.get('pokemon_v2_move') is None:
+        error = result.get('errors') if isinstance(result, dict) else None
+        print(f"Error fetching moves {move_ids[0]}-{move_ids[-1]}: {error or 'no move data in response'}")
+        await forget_cached_response(storage, response)
+        return None
 
-        move_data = response.json()
+    return [from_graphql_move(move) for move in data['pokemon_v2_move']]
 
+
+def process_move(move_id, move_data):
+    """Builds the output entry for a single move. Returns None if it was skipped or failed."""
+    try:
         # Skip moves with no effect entries (usually placeholder/unused moves)
         if not move_data.get('effect_entries'):
              print(f"Skipping move {move_id} (no effect entries)")
-             continue
+             return None
 
         primary_effect, secondary_effect, description = parse_effect_data(move_data)
 
@@ -403,22 +484,103 @@ for move_id in move_ids:
             "description": description,
         }
 
-        all_moves_data[str(move_id)] = move_output
         print(f"Processed move {move_id}: {move_data['name']}")
+        return move_output
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching move {move_id}: {e}")
     except Exception as e:
         print(f"Error processing move {move_id}: {e}") # Catch other potential errors
+        return None
 
-    time.sleep(REQUEST_DELAY) # Be polite to the API
 
-print(f"\nFetched and processed {len(all_moves_data)} moves.")
+def format_move_entry(move_id, move_output):
+    """Serializes one entry exactly as it appears inside the indented moves.json object."""
+    # Strip the b'{\n' and b'\n}' that wrap the single-key object
+    return orjson.dumps({str(move_id): move_output}, option=orjson.OPT_INDENT_2)[2:-2]
 
-# Write to JSON file
-try:
-    with open(OUTPUT_FILENAME, 'w') as f:
-        json.dump(all_moves_data, f, indent=2)
-    print(f"Successfully wrote move data to {OUTPUT_FILENAME}")
-except IOError as e:
-    print(f"Error writing to file {OUTPUT_FILENAME}: {e}")
\ No newline at end of file
+
+async def main():
+    moves_written = 0
+    failed_batches = 0
+
+    print(f"Fetching moves {MOVE_RANGE_START} to {MOVE_RANGE_END} from PokeAPI...")
+
+    with open('resources/needmoves.json', 'rb') as f:
+        move_ids = orjson.loads(f.read())
+
+    batches = [move_ids[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(move_ids), GRAPHQL_BATCH_SIZE)]
+
+    # One disk-cached HTTP/2 client shared by every request, so concurrent batches are
+    # multiplexed over a single connection; the semaphore bounds concurrency and the
+    # token bucket bounds the request rate
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = AsyncLimiter(REQUESTS_PER_SECOND, 1)
+    storage = hishel.AsyncFileStorage(
+        base_path=Path('pokeapi_cache_httpx'), ttl=timedelta(days=30).total_seconds()
+    )
+    controller = hishel.Controller(
+        cacheable_methods=["GET", "POST"], # GraphQL queries are POSTs
+        cacheable_status_codes=[200],
+        force_cache=True, # PokeAPI data is static; cache regardless of response headers
+    )
+
+    # Write each move to a temp file as soon as it's processed instead of building the
+    # whole result in memory first; moves.json is only replaced once every batch was
+    # fetched, so a failed run never leaves it truncated, half-written or missing moves
+    tmp_filename = OUTPUT_FILENAME + '.tmp'
+    try:
+        async with hishel.AsyncCacheClient(
+            storage=storage,
+            controller=controller,
+            http2=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=30.0,
+            headers={"User-Agent": "pokemonlegends/1.0"},
+        ) as client:
+            with open(tmp_filename, 'wb') as f:
+                # Start every batch up front, then consume them in needmoves.json order
+                tasks = [
+                    asyncio.create_task(fetch_move_batch(client, storage, semaphore, limiter, batch))
+                    for batch in batches
+                ]
+                try:
+                    for batch, task in zip(batches, tasks):
+                        batch_moves = await task
+                        if batch_moves is None:
+                            failed_batches += 1
+                            continue
+                        moves_by_id = {move['id']: move for move in batch_moves}
+                        for move_id in batch:
+                            move_data = moves_by_id.get(move_id)
+                            if move_data is None:
+                                print(f"Error fetching move {move_id}: not found")
+                                continue
+                            move_output = process_move(move_id, move_data)
+                            if move_output is None:
+                                continue
+                            f.write(b'{\n' if moves_written == 0 else b',\n')
+                            f.write(format_move_entry(move_id, move_output))
+                            moves_written += 1
+                finally:
+                    # If the loop bailed out early, don't leave batches running in the background
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+                f.write(b'\n}' if moves_written else b'{}')
+
+        if failed_batches:
+            raise RuntimeError(
+                f"Failed to fetch {failed_batches} of {len(batches)} move batches; {OUTPUT_FILENAME} left unchanged"
+            )
+        os.replace(tmp_filename, OUTPUT_FILENAME)
+        print(f"\nFetched and processed {moves_written} moves.")
+        print(f"Successfully wrote move data to {OUTPUT_FILENAME}")
+    except IOError as e:
+        print(f"Error writing to file {OUTPUT_FILENAME}: {e}")
+    finally:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
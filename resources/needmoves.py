@@ -1,22 +1,19 @@
-import json
+import ijson
+import orjson
 
 def extract_move_ids():
-    # Read pokemon data
-    with open('resources/pokemon.json', 'r') as f:
-        pokemon_data = json.load(f)
-    
-    # Extract all move IDs
+    # Stream the move lists out of pokemon data instead of loading the whole file
     move_ids = set()
-    for pokemon in pokemon_data['pokemons']:
-        for move in pokemon['moves']:
+    with open('resources/pokemon.json', 'rb') as f:
+        for move in ijson.items(f, 'pokemons.item.moves.item'):
             move_ids.add(move[0])
-    
+
     # Convert to sorted list
     move_ids = sorted(list(move_ids))
-    
+
     # Save to needmoves.json
-    with open('resources/needmoves.json', 'w') as f:
-        json.dump(move_ids, f, indent=2)
+    with open('resources/needmoves.json', 'wb') as f:
+        f.write(orjson.dumps(move_ids, option=orjson.OPT_INDENT_2))
 
 if __name__ == '__main__':
     extract_move_ids()
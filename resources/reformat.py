@@ -1,23 +1,104 @@
-import json
+import orjson
 import requests
+import requests_cache
+from datetime import timedelta
+from ratelimit import limits, sleep_and_retry
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POKEAPI_GRAPHQL_URL = "https://beta.pokeapi.co/graphql/v1beta"
+GRAPHQL_BATCH_SIZE = 50 # Species fetched per GraphQL query
+REQUESTS_PER_SECOND = 10 # Aggregate rate limit towards PokeAPI
+
+GROWTH_RATES_QUERY = """
+query growthRates($ids: [Int!]) {
+  pokemon_v2_pokemonspecies(where: {id: {_in: $ids}}) {
+    id
+    pokemon_v2_growthrate { name }
+  }
+}
+"""
+
+def is_cacheable(response):
+    """Keeps GraphQL error bodies out of the cache, since Hasura reports those with a 200."""
+    try:
+        result = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return False
+    return isinstance(result, dict) and not result.get('errors') and bool(result.get('data'))
+
+# Shared session so the batch queries reuse a keep-alive connection to PokeAPI,
+# with responses cached on disk so re-runs skip the network entirely
+session = requests_cache.CachedSession(
+    'pokeapi_cache',
+    backend='sqlite',
+    expire_after=timedelta(days=30),
+    allowable_codes=(200,),
+    allowable_methods=('GET', 'POST'), # GraphQL queries are POSTs
+    filter_fn=is_cacheable,
+)
+# The GraphQL queries are read-only, so POSTs are safe to retry too
+session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=None
+)))
+
+@sleep_and_retry
+@limits(calls=REQUESTS_PER_SECOND, period=1)
+def fetch_growth_rates(species_ids):
+    """
+    Fetches growth rates for a batch of species in one GraphQL query, keyed by species id.
+    Returns None if the request failed.
+    """
+    payload = {"query": GROWTH_RATES_QUERY, "variables": {"ids": species_ids}}
+    try:
+        response = session.post(POKEAPI_GRAPHQL_URL, json=payload, timeout=10)
+        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+        result = orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        print(f"Error fetching growth rates for species {species_ids[0]}-{species_ids[-1]}: {e}")
+        return None
+
+    data = result.get('data') if isinstance(result, dict) else None
+    if not data or result.get('errors') or data.get('pokemon_v2_pokemonspecies') is None:
+        error = result.get('errors') if isinstance(result, dict) else None
+        print(f"Error fetching growth rates for species {species_ids[0]}-{species_ids[-1]}: {error or 'no species data in response'}")
+        return None
+
+    return {
+        species['id']: species['pokemon_v2_growthrate']['name']
+        for species in data['pokemon_v2_pokemonspecies']
+    }
 
 # Open the pokemon.json file
-with open('resources/pokemon.json', 'r') as file:
-    pokemon_data = json.load(file)
+with open('resources/pokemon.json', 'rb') as file:
+    pokemon_data = orjson.loads(file.read())
+
+# Get growth rates from PokeAPI, a batch of species per request
+species_ids = [pokemon['id'] for pokemon in pokemon_data['pokemons']]
+batches = [species_ids[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(species_ids), GRAPHQL_BATCH_SIZE)]
+print(f"Fetching growth rates for {len(species_ids)} species in {len(batches)} batches")
+growth_rates = {}
+failed_batches = 0
+for batch in batches:
+    batch_growth_rates = fetch_growth_rates(batch)
+    if batch_growth_rates is None:
+        failed_batches += 1
+        continue
+    growth_rates.update(batch_growth_rates)
+
+# Defaulting a whole failed batch to 'medium' would silently corrupt pokemon2.json,
+# so leave the existing file alone instead
+if failed_batches:
+    raise RuntimeError(f"Failed to fetch {failed_batches} of {len(batches)} growth rate batches")
 
-# Add growth rate for each pokemon
+# Add growth rate for each pokemon, defaulting species PokeAPI didn't return
 for pokemon in pokemon_data['pokemons']:
-    print(f"Fetching growth rate for {pokemon['name']}")
-    # Get pokemon data from PokeAPI
-    response = requests.get(f"https://pokeapi.co/api/v2/pokemon-species/{pokemon['id']}")
-    if response.status_code == 200:
-        species_data = response.json()
-        growth_rate = species_data['growth_rate']['name']
-        pokemon['growth_rate'] = growth_rate
-    else:
+    growth_rate = growth_rates.get(pokemon['id'])
+    if growth_rate is None:
         print(f"Failed to fetch growth rate for {pokemon['name']}")
-        pokemon['growth_rate'] = 'medium' # Default fallback
+        growth_rate = 'medium' # Default fallback
+    pokemon['growth_rate'] = growth_rate
 
 # Save to new file
-with open('resources/pokemon2.json', 'w') as file:
-    json.dump(pokemon_data, file, indent=2)
+with open('resources/pokemon2.json', 'wb') as file:
+    file.write(orjson.dumps(pokemon_data, option=orjson.OPT_INDENT_2))